@@ -0,0 +1,63 @@
+"""Compare pyaimp.encode_player_state with JSON, in payload size and encoding/decoding time.
+
+Usage: python benchmarks/player_state_encoding.py
+"""
+import os
+import sys
+import json
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pyaimp
+
+ITERATIONS = 100000
+
+state = {
+    'bit_rate': 320,
+    'channels': 2,
+    'duration': 245000,
+    'file_size': 9823744,
+    'file_mark': 0,
+    'track_number': 7,
+    'sample_rate': 44100,
+    'album': 'The Dark Side of the Moon',
+    'artist': 'Pink Floyd',
+    'year': '1973',
+    'filename': 'D:\\Music\\Pink Floyd\\The Dark Side of the Moon\\07 - Money.mp3',
+    'genre': 'Progressive Rock',
+    'title': 'Money',
+    'playback_state': pyaimp.PlayBackState.Playing,
+    'position': 61250,
+    'volume': 80,
+    'muted': False,
+    'track_repeated': False,
+    'shuffled': True,
+    'recording': False
+}
+
+next_state = dict(state, position=61500)
+
+
+def json_encode(s):
+    return json.dumps(s, default=pyaimp._json_default).encode('utf-8')
+
+
+def main():
+    payloads = [
+        ('JSON', json_encode(state), lambda: json_encode(next_state), lambda data: json.loads(data.decode('utf-8'))),
+        ('Binary (full)', pyaimp.encode_player_state(state), lambda: pyaimp.encode_player_state(next_state), pyaimp.decode_player_state),
+        ('Binary (delta)', pyaimp.encode_player_state(next_state, state), lambda: pyaimp.encode_player_state(next_state, state), lambda data: pyaimp.decode_player_state(data, state))
+    ]
+
+    print('{:<16} {:>8} {:>12} {:>12}'.format('Encoding', 'Bytes', 'Encode (us)', 'Decode (us)'))
+
+    for name, payload, encode, decode in payloads:
+        encode_time = timeit.timeit(encode, number=ITERATIONS) / ITERATIONS * 1e6
+        decode_time = timeit.timeit(lambda: decode(payload), number=ITERATIONS) / ITERATIONS * 1e6
+
+        print('{:<16} {:>8} {:>12.2f} {:>12.2f}'.format(name, len(payload), encode_time, decode_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 from mmapfile import mmapfile
 from enum import Enum
-from collections import OrderedDict
+from collections import OrderedDict, Counter, deque
 import struct
 import win32gui
 import win32api
@@ -8,14 +8,57 @@ import win32con
 import win32process
 import io
 import subprocess
+import socketserver
+import argparse
+import json
+import sys
+import hmac
+import binascii
+import functools
+import os
+import tempfile
+import glob
+import time
+import itertools
+import concurrent.futures
+import threading
+import ctypes
+import heapq
+import datetime
+import bisect
+import re
+import logging
+from pyaimpctl import DAEMON_DEFAULT_HOST, DAEMON_DEFAULT_PORT, DAEMON_CONNECT_TIMEOUT, \
+    _get_daemon_token_path, send_to_daemon
+import pyaimpctl
 
 __version__ = '0.2.3'
 
 __all__ = [
     'PlayBackState',
-    'Client'
+    'Client',
+    'Daemon',
+    'send_to_daemon',
+    'TrackInfoRecords',
+    'write_playlist',
+    'DirectoryScanner',
+    'ListeningStatistics',
+    'StatePublisher',
+    'StateReader',
+    'MessageWindowSource',
+    'NotificationListener',
+    'ScheduledAction',
+    'Scheduler',
+    'encode_player_state',
+    'decode_player_state',
+    'QueueManager',
+    'TrackIndex',
+    'init_worker_client',
+    'get_worker_client'
 ]
 
+logger = logging.getLogger('pyaimp')
+
 AIMPRemoteAccessClass = 'AIMP2_RemoteInfo'
 AIMPRemoteAccessMapFileSize = 2048
 
@@ -38,10 +81,30 @@ AIMPRemoteAccessPackFormat = OrderedDict([
     ('TitleLength', 'L')
 ])
 
+AIMPRemoteAccessTrackInfoNumericFields = OrderedDict([
+    ('bit_rate', 'BitRate'),
+    ('channels', 'Channels'),
+    ('duration', 'Duration'),
+    ('file_size', 'FileSize'),
+    ('file_mark', 'FileMark'),
+    ('track_number', 'TrackNumber'),
+    ('sample_rate', 'SampleRate')
+])
+
+AIMPRemoteAccessTrackInfoStringFields = OrderedDict([
+    ('album', 'AlbumLength'),
+    ('artist', 'ArtistLength'),
+    ('year', 'DateLength'),
+    ('filename', 'FileNameLength'),
+    ('genre', 'GenreLength'),
+    ('title', 'TitleLength')
+])
+
 # -----------------------------------------------------
 # Message types to send to AIMP
 
 WM_AIMP_COMMAND = win32con.WM_USER + 0x75
+WM_AIMP_NOTIFY = win32con.WM_USER + 0x76
 WM_AIMP_PROPERTY = win32con.WM_USER + 0x77
 
 # -----------------------------------------------------
@@ -66,6 +129,8 @@ AIMP_RA_PROPERTY_VISUAL_FULLSCREEN = 0xA0
 
 AIMP_RA_CMD_BASE = 10
 
+AIMP_RA_CMD_REGISTER_NOTIFY = AIMP_RA_CMD_BASE + 1
+AIMP_RA_CMD_UNREGISTER_NOTIFY = AIMP_RA_CMD_BASE + 2
 AIMP_RA_CMD_PLAY = AIMP_RA_CMD_BASE + 3
 AIMP_RA_CMD_PLAYPAUSE = AIMP_RA_CMD_BASE + 4
 AIMP_RA_CMD_PAUSE = AIMP_RA_CMD_BASE + 5
@@ -82,13 +147,181 @@ AIMP_RA_CMD_ADD_URL = AIMP_RA_CMD_BASE + 15
 AIMP_RA_CMD_OPEN_FILES = AIMP_RA_CMD_BASE + 16
 AIMP_RA_CMD_OPEN_FOLDERS = AIMP_RA_CMD_BASE + 17
 AIMP_RA_CMD_OPEN_PLAYLISTS = AIMP_RA_CMD_BASE + 18
+AIMP_RA_CMD_GET_ALBUMART = AIMP_RA_CMD_BASE + 19
 AIMP_RA_CMD_VISUAL_START = AIMP_RA_CMD_BASE + 20
 AIMP_RA_CMD_VISUAL_STOP = AIMP_RA_CMD_BASE + 21
 
+WM_AIMP_COPYDATA_ALBUMART_ID = 0x41495043
+
+# -----------------------------------------------------
+# Notifications
+
+AIMP_RA_NOTIFY_BASE = 0
+
+AIMP_RA_NOTIFY_TRACK_INFO = AIMP_RA_NOTIFY_BASE + 1
+AIMP_RA_NOTIFY_TRACK_START = AIMP_RA_NOTIFY_BASE + 2
+AIMP_RA_NOTIFY_PROPERTY = AIMP_RA_NOTIFY_BASE + 3
+
+AIMPPropertyGetters = {
+    AIMP_RA_PROPERTY_VERSION: 'get_version',
+    AIMP_RA_PROPERTY_PLAYER_POSITION: 'get_player_position',
+    AIMP_RA_PROPERTY_PLAYER_DURATION: 'get_current_track_duration',
+    AIMP_RA_PROPERTY_PLAYER_STATE: 'get_playback_state',
+    AIMP_RA_PROPERTY_VOLUME: 'get_volume',
+    AIMP_RA_PROPERTY_MUTE: 'is_muted',
+    AIMP_RA_PROPERTY_TRACK_REPEAT: 'is_track_repeated',
+    AIMP_RA_PROPERTY_TRACK_SHUFFLE: 'is_shuffled',
+    AIMP_RA_PROPERTY_RADIOCAP: 'is_recording',
+    AIMP_RA_PROPERTY_VISUAL_FULLSCREEN: 'is_visualization_fullscreen'
+}
+
+# -----------------------------------------------------
+# Process pools
+
+_worker_client = None
+
+
+def init_worker_client(client=None):
+    """Initialize the :class:`pyaimp.Client` instance of the current process, which is then returned by
+    :func:`pyaimp.get_worker_client`. Meant to be used as a process pool initializer, e.g:
+
+    .. code-block:: python
+
+        pool = multiprocessing.Pool(initializer=pyaimp.init_worker_client, initargs=(pyaimp.Client(),))
+
+    :param pyaimp.Client client: Instance to use (typically pickled from the parent process, so AIMP detection
+                                 isn't run again). A new one is created if not provided
+    :rtype: None
+    """
+    global _worker_client
+
+    _worker_client = client if client is not None else Client()
+
+
+def get_worker_client():
+    """Return the :class:`pyaimp.Client` instance of the current process, initializing it using
+    :func:`pyaimp.init_worker_client` if needed.
+
+    :rtype: pyaimp.Client
+    """
+    if _worker_client is None:
+        init_worker_client()
+
+    return _worker_client
+
+
+# -----------------------------------------------------
+# Temporary playlists
+
+TemporaryPlaylistPrefix = 'pyaimp-'
+TemporaryPlaylistSuffix = '.m3u8'
+TemporaryPlaylistLifetime = 300
+
+# -----------------------------------------------------
+# Daemon
+
+DaemonCommands = frozenset([
+    'get_current_track_info',
+    'get_player_state',
+    'get_version',
+    'get_player_position',
+    'set_player_position',
+    'get_current_track_duration',
+    'get_playback_state',
+    'get_volume',
+    'set_volume',
+    'is_muted',
+    'set_muted',
+    'is_track_repeated',
+    'set_track_repeated',
+    'is_shuffled',
+    'set_shuffled',
+    'is_recording',
+    'set_recording',
+    'is_visualization_fullscreen',
+    'set_visualization_fullscreen',
+    'play',
+    'play_pause',
+    'pause',
+    'stop',
+    'next',
+    'prev',
+    'next_visualization',
+    'prev_visualization',
+    'start_visualization',
+    'stop_visualization'
+])
+
+# -----------------------------------------------------
+# Shared state
+
+SharedStateName = 'pyaimp_state'
+SharedStateMapFileSize = 4096
+SharedStateStringMaxSize = 512
+
+SharedStateSequenceFormat = '<I'
+
+SharedStatePackFormat = OrderedDict([
+    ('timestamp', 'd'),
+    ('playback_state', 'b'),
+    ('position', 'I'),
+    ('volume', 'B'),
+    ('muted', '?'),
+    ('track_repeated', '?'),
+    ('shuffled', '?'),
+    ('recording', '?'),
+    ('bit_rate', 'I'),
+    ('channels', 'I'),
+    ('duration', 'I'),
+    ('file_size', 'i'),
+    ('file_mark', 'I'),
+    ('track_number', 'I'),
+    ('sample_rate', 'I')
+])
+
+# -----------------------------------------------------
+# Player state encoding
+
+PlayerStateEncodingVersion = 1
+PlayerStateEncodingDeltaFlag = 0x01
+
+PlayerStateEncodingFields = OrderedDict([
+    ('playback_state', 'b'),
+    ('position', 'I'),
+    ('volume', 'B'),
+    ('muted', '?'),
+    ('track_repeated', '?'),
+    ('shuffled', '?'),
+    ('recording', '?'),
+    ('bit_rate', 'I'),
+    ('channels', 'I'),
+    ('duration', 'I'),
+    ('file_size', 'i'),
+    ('file_mark', 'I'),
+    ('track_number', 'I'),
+    ('sample_rate', 'I'),
+    ('album', 's'),
+    ('artist', 's'),
+    ('year', 's'),
+    ('filename', 's'),
+    ('genre', 's'),
+    ('title', 's')
+])
+
 
 # -----------------------------------------------------
 
 
+class _COPYDATASTRUCT(ctypes.Structure):
+    """Windows ``COPYDATASTRUCT`` structure, which is pointed by the ``WM_COPYDATA`` messages parameter."""
+
+    _fields_ = [
+        ('dwData', ctypes.c_size_t),
+        ('cbData', ctypes.c_ulong),
+        ('lpData', ctypes.c_void_p)
+    ]
+
+
 class PlayBackState(Enum):
     """Enumeration (extending :py:class:`enum.Enum`) of all possible AIMP playback states.
 
@@ -110,12 +343,48 @@ class Client:
 
        Consider all methods in this class to be **blocking** and **non-thread safe**.
 
+    Instances may be pickled (e.g to be sent to other processes): only the AIMP executable path is kept, the
+    AIMP window handler being lazily found again when first needed by the unpickled instance. See
+    :func:`pyaimp.init_worker_client` to use a single instance per process pool worker.
+
+    :param int album_art_cache_size: Maximum total size, in bytes, of the album arts cached by :func:`pyaimp.Client.get_album_art`
     :raises RuntimeError: The AIMP window cannot be found.
     """
 
-    def __init__(self):
+    def __init__(self, album_art_cache_size=16 * 1024 * 1024):
+        self._init_process_state(album_art_cache_size)
+
         self.detect_aimp()
 
+    def __getstate__(self):
+        return {
+            'album_art_cache_size': self.album_art_cache_size,
+            'aimp_exe_path': self._aimp_exe_path
+        }
+
+    def __setstate__(self, state):
+        self._init_process_state(state['album_art_cache_size'])
+
+        self._aimp_window = None
+        self._aimp_exe_path = state['aimp_exe_path']
+
+    def _init_process_state(self, album_art_cache_size):
+        """Initialize the attributes which can't be shared with other processes."""
+        self.album_art_cache_size = album_art_cache_size
+
+        self._album_art_cache = OrderedDict()
+        self._album_art_cache_used = 0
+        self._received_album_art = None
+        self._message_window = None
+        self._pid = os.getpid()
+
+    def _get_window(self):
+        """Return the AIMP window handler, finding it first if this instance has just been unpickled."""
+        if not self._aimp_window:
+            self._get_aimp_window()
+
+        return self._aimp_window
+
     def _get_aimp_window(self):
         """Find the AIMP window handler who provides the remote API calls endpoint.
 
@@ -144,15 +413,15 @@ class Client:
 
     def _get_prop(self, prop_id):
         """Retrieve an AIMP property."""
-        return win32api.SendMessage(self._aimp_window, WM_AIMP_PROPERTY, prop_id | AIMP_RA_PROPVALUE_GET, 0)
+        return win32api.SendMessage(self._get_window(), WM_AIMP_PROPERTY, prop_id | AIMP_RA_PROPVALUE_GET, 0)
 
     def _set_prop(self, prop_id, value):
         """Set an AIMP property."""
-        win32api.SendMessage(self._aimp_window, WM_AIMP_PROPERTY, prop_id | AIMP_RA_PROPVALUE_SET, value)
+        win32api.SendMessage(self._get_window(), WM_AIMP_PROPERTY, prop_id | AIMP_RA_PROPVALUE_SET, value)
 
     def _send_command(self, command_id, parameter=None):
         """Send an AIMP command."""
-        return win32api.SendMessage(self._aimp_window, WM_AIMP_COMMAND, command_id, parameter)
+        return win32api.SendMessage(self._get_window(), WM_AIMP_COMMAND, command_id, parameter)
 
     def _run_cli_command(self, command, param1=None):
         """Run an AIMP CLI command."""
@@ -213,30 +482,96 @@ class Client:
 
         meta_data_unpacked = dict(zip(AIMPRemoteAccessPackFormat.keys(), struct.unpack(pack_format, meta_data_raw)))
 
-        track_data = mapped_file.read(mapped_file.size() - mapped_file.tell()).decode('utf-16').replace('\x00', '')
+        track_data_raw = mapped_file.read(mapped_file.size() - mapped_file.tell())
 
         mapped_file.close()
 
-        ret = {
-            'bit_rate': meta_data_unpacked['BitRate'],
-            'channels': meta_data_unpacked['Channels'],
-            'duration': meta_data_unpacked['Duration'],
-            'file_size': meta_data_unpacked['FileSize'],
-            'file_mark': meta_data_unpacked['FileMark'],
-            'track_number': meta_data_unpacked['TrackNumber'],
-            'sample_rate': meta_data_unpacked['SampleRate']
-        }
+        return _decode_track_info(meta_data_unpacked, track_data_raw)
 
-        with io.StringIO(track_data) as s:
-            ret['album'] = s.read(meta_data_unpacked['AlbumLength'])
-            ret['artist'] = s.read(meta_data_unpacked['ArtistLength'])
-            ret['year'] = s.read(meta_data_unpacked['DateLength'])
-            ret['filename'] = s.read(meta_data_unpacked['FileNameLength'])
-            ret['genre'] = s.read(meta_data_unpacked['GenreLength'])
-            ret['title'] = s.read(meta_data_unpacked['TitleLength'])
+    def get_player_state(self):
+        """Return a dictionary of the current active track information (see
+        :func:`pyaimp.Client.get_current_track_info`) along with the current player properties.
+
+        Additional dictionary keys are:
+
+          - ``playback_state`` (:class:`pyaimp.PlayBackState`): See :func:`pyaimp.Client.get_playback_state`
+          - ``position`` (``int``): See :func:`pyaimp.Client.get_player_position`
+          - ``volume`` (``int``): See :func:`pyaimp.Client.get_volume`
+          - ``muted`` (``bool``): See :func:`pyaimp.Client.is_muted`
+          - ``track_repeated`` (``bool``): See :func:`pyaimp.Client.is_track_repeated`
+          - ``shuffled`` (``bool``): See :func:`pyaimp.Client.is_shuffled`
+          - ``recording`` (``bool``): See :func:`pyaimp.Client.is_recording`
+
+        :rtype: dict
+        """
+        ret = self.get_current_track_info()
+
+        ret.update({
+            'playback_state': self.get_playback_state(),
+            'position': self.get_player_position(),
+            'volume': self.get_volume(),
+            'muted': self.is_muted(),
+            'track_repeated': self.is_track_repeated(),
+            'shuffled': self.is_shuffled(),
+            'recording': self.is_recording()
+        })
 
         return ret
 
+    def _on_copy_data(self, hwnd, msg, wparam, lparam):
+        """Handle the ``WM_COPYDATA`` messages AIMP sends the album art with."""
+        copy_data = ctypes.cast(lparam, ctypes.POINTER(_COPYDATASTRUCT)).contents
+
+        if copy_data.dwData != WM_AIMP_COPYDATA_ALBUMART_ID:
+            return 0
+
+        self._received_album_art = ctypes.string_at(copy_data.lpData, copy_data.cbData) if copy_data.cbData else None
+
+        return 1
+
+    def get_album_art(self):
+        """Return the current track album art as the raw image file content (i.e JPEG or PNG), or ``None`` if
+        there isn't any.
+
+        Album arts are kept in a LRU cache keyed by the current track identity, whose total size is limited to
+        ``album_art_cache_size`` bytes. Missing album arts aren't cached, as AIMP may not have loaded it yet
+        when a track starts.
+
+        Retrieving the album art requires a hidden window to receive it, which is created on the first call.
+        Always use this method from the same thread.
+
+        :rtype: bytes
+        """
+        track_info = self.get_current_track_info()
+
+        key = (track_info['filename'], track_info['artist'], track_info['album'], track_info['title'])
+
+        if self._pid != os.getpid():
+            self._init_process_state(self.album_art_cache_size)
+
+        if key in self._album_art_cache:
+            self._album_art_cache.move_to_end(key)
+
+            return self._album_art_cache[key]
+
+        if not self._message_window:
+            self._message_window = _create_message_window({win32con.WM_COPYDATA: self._on_copy_data})
+
+        self._send_command(AIMP_RA_CMD_GET_ALBUMART, self._message_window)
+
+        album_art, self._received_album_art = self._received_album_art, None
+
+        if album_art and len(album_art) <= self.album_art_cache_size:
+            self._album_art_cache[key] = album_art
+            self._album_art_cache_used += len(album_art)
+
+            while self._album_art_cache_used > self.album_art_cache_size:
+                _, evicted = self._album_art_cache.popitem(last=False)
+
+                self._album_art_cache_used -= len(evicted)
+
+        return album_art
+
     # -----------------------------------------------------
     # Properties
 
@@ -576,3 +911,1924 @@ class Client:
         :rtype: None
         """
         self._run_cli_command('QUEUE', obj)
+
+    # -----------------------------------------------------
+    # Playlists
+
+    def _run_with_playlist(self, cli_method, paths):
+        """Stream paths to a temporary M3U8 playlist and give it to a CLI command method.
+
+        The CLI command only forwards the playlist path to the running AIMP instance, which reads it later on.
+        The playlist is thus only deleted by the calls made at least ``TemporaryPlaylistLifetime`` seconds
+        later (in this process or another one), which sweep the stale temporary playlists."""
+        start = time.perf_counter()
+
+        _remove_stale_temporary_playlists()
+
+        fd, playlist = tempfile.mkstemp(prefix=TemporaryPlaylistPrefix, suffix=TemporaryPlaylistSuffix)
+
+        try:
+            with io.open(fd, 'w', encoding='utf-8') as f:
+                tracks = write_playlist(paths, f)
+
+            if tracks:
+                cli_method(playlist)
+        except BaseException:
+            _remove_file(playlist)
+
+            raise
+
+        if not tracks:
+            _remove_file(playlist)
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            'tracks': tracks,
+            'elapsed': elapsed,
+            'tracks_per_second': tracks / elapsed if elapsed else 0.0
+        }
+
+    def add_tracks_to_playlist_and_play(self, paths):
+        """Add any number of tracks to a playlist and start playing, in a single CLI ``/ADD_PLAY`` command.
+
+        Paths are streamed to a temporary playlist file which is deleted afterwards, so ``paths`` may be a
+        generator yielding a very large number of tracks.
+
+        Returned dictionary keys are:
+
+          - ``tracks`` (``int``): Number of added tracks
+          - ``elapsed`` (``float``): Total time taken, in seconds
+          - ``tracks_per_second`` (``float``): Throughput
+
+        :param iterable paths: Paths to files (or URLs to streams)
+        :rtype: dict
+        """
+        return self._run_with_playlist(self.add_to_playlist_and_play, paths)
+
+    def add_tracks_to_active_playlist(self, paths):
+        """Add any number of tracks to the active playlist, in a single CLI ``/INSERT`` command.
+
+        See :func:`pyaimp.Client.add_tracks_to_playlist_and_play` for details.
+
+        :param iterable paths: Paths to files (or URLs to streams)
+        :rtype: dict
+        """
+        return self._run_with_playlist(self.add_to_active_playlist, paths)
+
+    def add_tracks_to_active_playlist_custom(self, paths):
+        """Add any number of tracks to the active playlist and put them in custom playback queue, in a single
+        CLI ``/QUEUE`` command.
+
+        See :func:`pyaimp.Client.add_tracks_to_playlist_and_play` for details.
+
+        :param iterable paths: Paths to files (or URLs to streams)
+        :rtype: dict
+        """
+        return self._run_with_playlist(self.add_to_active_playlist_custom, paths)
+
+    def add_scanned_dirs_to_playlist(self, dirs, scanner=None, batch_size=1000):
+        """Client-side alternative to :func:`pyaimp.Client.add_dirs_to_playlist`: scan directories using a
+        :class:`pyaimp.DirectoryScanner`, then add the matching files to the active playlist by batches of CLI
+        ``/INSERT`` commands while the scan is still running.
+
+        Reuse the same ``scanner`` to benefit from its directory listings cache.
+
+        Returned dictionary keys are the same as :func:`pyaimp.Client.add_tracks_to_playlist_and_play` ones.
+
+        :param dirs: Path to a directory, or list of paths to directories
+        :param pyaimp.DirectoryScanner scanner: Scanner to use. A new one accepting all files if not provided
+        :param int batch_size: Maximum number of files to add per CLI command
+        :rtype: dict
+        """
+        if isinstance(dirs, str):
+            dirs = [dirs]
+
+        scanner = scanner or DirectoryScanner()
+
+        start = time.perf_counter()
+
+        files = scanner.scan(*dirs)
+        tracks = 0
+
+        while True:
+            result = self.add_tracks_to_active_playlist(itertools.islice(files, batch_size))
+
+            if not result['tracks']:
+                break
+
+            tracks += result['tracks']
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            'tracks': tracks,
+            'elapsed': elapsed,
+            'tracks_per_second': tracks / elapsed if elapsed else 0.0
+        }
+
+
+def _decode_track_info(meta_data_unpacked, track_data_raw):
+    """Build the dictionary returned by :func:`pyaimp.Client.get_current_track_info` from the unpacked
+    ``AIMPRemoteAccessPackFormat`` header and the raw UTF-16 strings which follow it."""
+    ret = {key: meta_data_unpacked[field] for key, field in AIMPRemoteAccessTrackInfoNumericFields.items()}
+
+    track_data = track_data_raw.decode('utf-16').replace('\x00', '')
+
+    with io.StringIO(track_data) as s:
+        for key, length_field in AIMPRemoteAccessTrackInfoStringFields.items():
+            ret[key] = s.read(meta_data_unpacked[length_field])
+
+    return ret
+
+
+def _remove_file(path):
+    """Delete a file, ignoring errors (e.g if it has already been deleted)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _remove_stale_temporary_playlists():
+    """Delete the temporary playlists older than ``TemporaryPlaylistLifetime`` seconds."""
+    expiration = time.time() - TemporaryPlaylistLifetime
+
+    for playlist in glob.glob(os.path.join(tempfile.gettempdir(), TemporaryPlaylistPrefix + '*' + TemporaryPlaylistSuffix)):
+        try:
+            if os.path.getmtime(playlist) < expiration:
+                os.remove(playlist)
+        except OSError:
+            pass
+
+
+def write_playlist(paths, f):
+    """Write paths to an M3U8 playlist one at a time, so memory usage doesn't depend on their number.
+
+    :param iterable paths: Paths (``str`` or path-like objects) to files, or URLs to streams
+    :param f: Text file object opened using the UTF-8 encoding
+    :return: Number of written paths
+    :rtype: int
+    """
+    f.write('#EXTM3U\n')
+
+    tracks = 0
+
+    for path in paths:
+        f.write(os.fspath(path) + '\n')
+
+        tracks += 1
+
+    return tracks
+
+
+class DirectoryScanner:
+    """Walk directory trees using :func:`os.scandir` across a thread pool and filter the files found.
+
+    Directory listings are cached and keyed by the directory modification time, so rescanning an unchanged
+    tree only costs one ``stat`` call per directory. Note that a directory modification time only changes
+    when entries are added, removed or renamed in it: files modified in place keep their cached size and
+    modification time until then.
+
+    Unreadable directories are silently skipped, and symbolic links to directories aren't followed, like
+    :func:`os.walk` does. A directory reachable through several paths (e.g using junctions) is only scanned
+    once, unless its filesystem doesn't provide file identifiers (e.g some network shares).
+
+    :param iterable extensions: File extensions to accept (e.g ``['mp3', '.flac']``), case-insensitive. All if not provided
+    :param int min_size: Minimum file size, in bytes
+    :param int max_size: Maximum file size, in bytes
+    :param float modified_after: Only accept files modified after this timestamp
+    :param float modified_before: Only accept files modified before this timestamp
+    :param int max_workers: Maximum number of directories listed simultaneously
+    """
+
+    def __init__(self, extensions=None, min_size=None, max_size=None, modified_after=None, modified_before=None, max_workers=8):
+        self.extensions = {
+            ('' if extension.startswith('.') else '.') + extension.lower() for extension in extensions
+        } if extensions else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.max_workers = max_workers
+
+        self._cache = {}
+
+    def _list_dir(self, path):
+        """Return the identity (device and inode numbers, or ``None`` if the filesystem doesn't provide any),
+        the files (as ``(path, size, mtime)`` tuples) and the subdirectories of a directory."""
+        try:
+            dir_stat = os.stat(path)
+            dir_id = (dir_stat.st_dev, dir_stat.st_ino) if dir_stat.st_ino else None
+
+            cached = self._cache.get(path)
+
+            if cached and cached[0] == dir_stat.st_mtime_ns:
+                return dir_id, cached[1], cached[2]
+
+            files = []
+            subdirs = []
+
+            for entry in os.scandir(path):
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+
+                    files.append((entry.path, stat.st_size, stat.st_mtime))
+        except OSError:
+            return None, [], []
+
+        self._cache[path] = (dir_stat.st_mtime_ns, files, subdirs)
+
+        return dir_id, files, subdirs
+
+    def _accept(self, size, mtime):
+        """Check a file size and modification time against the filters."""
+        return not (
+            (self.min_size is not None and size < self.min_size) or
+            (self.max_size is not None and size > self.max_size) or
+            (self.modified_after is not None and mtime <= self.modified_after) or
+            (self.modified_before is not None and mtime >= self.modified_before)
+        )
+
+    def scan(self, *dirs):
+        """Yield the paths of the accepted files found in the given directories and their subdirectories,
+        as soon as their parent directory has been listed (thus in no particular order).
+
+        :param str dirs: Paths to directories
+        :rtype: generator
+        """
+        visited = set()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._list_dir, path) for path in dirs}
+
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    dir_id, files, subdirs = future.result()
+
+                    if dir_id is not None:
+                        if dir_id in visited:
+                            continue
+
+                        visited.add(dir_id)
+
+                    pending.update(executor.submit(self._list_dir, path) for path in subdirs)
+
+                    for path, size, mtime in files:
+                        if self.extensions and os.path.splitext(path)[1].lower() not in self.extensions:
+                            continue
+
+                        if self._accept(size, mtime):
+                            yield path
+
+
+# -----------------------------------------------------
+# Statistics
+
+
+class ListeningStatistics:
+    """Incremental listening statistics, fed by observations of the player state.
+
+    Each observation updates the aggregates in constant time. The listening time is computed from the
+    player position progression between two consecutive observations of the same track, so seeks and
+    pauses aren't counted. A forward progression larger than the wall-clock time elapsed since the previous
+    observation (plus ``max_drift``) is considered to be a seek and is ignored.
+
+    A play is counted each time a track starts being observed while playing: after another track, after
+    the playback has been stopped, or when its position jumps back to its beginning (i.e it's repeated).
+
+    Aggregates are kept in :class:`collections.Counter` instances (durations being in milliseconds):
+
+      - ``play_counts``: Number of plays per filename
+      - ``listened``: Listening time per filename
+      - ``artists``: Listening time per artist
+      - ``genres``: Listening time per genre
+
+    :param str snapshot_path: Path to the JSON file to periodically save the aggregates to
+    :param float snapshot_interval: Minimum number of seconds between two snapshots
+    :param int max_drift: Tolerance, in milliseconds, applied when checking the position progression
+    """
+
+    snapshot_version = 1
+
+    def __init__(self, snapshot_path=None, snapshot_interval=300.0, max_drift=1000):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.max_drift = max_drift
+
+        self.plays = 0
+        self.total_listened = 0
+        self.play_counts = Counter()
+        self.listened = Counter()
+        self.artists = Counter()
+        self.genres = Counter()
+
+        self._current_filename = None
+        self._last_position = None
+        self._last_timestamp = None
+        self._last_snapshot = None
+
+    def observe(self, track_info, playback_state, position, timestamp=None):
+        """Update the aggregates given an observation of the player state.
+
+        Observations should be made at least every few seconds in order to correctly detect the seeks.
+
+        :param dict track_info: Result of :func:`pyaimp.Client.get_current_track_info`
+        :param pyaimp.PlayBackState playback_state: Result of :func:`pyaimp.Client.get_playback_state`
+        :param int position: Result of :func:`pyaimp.Client.get_player_position`
+        :param float timestamp: Time of the observation, in seconds. Defaults to :func:`time.monotonic`
+        :rtype: None
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        filename = track_info['filename']
+
+        if playback_state == PlayBackState.Stopped:
+            self._current_filename = None
+
+        if playback_state != PlayBackState.Playing or not filename:
+            self._last_position = None
+        else:
+            restarted = self._last_position is not None and \
+                position < self._last_position and \
+                position <= (timestamp - self._last_timestamp) * 1000 + self.max_drift
+
+            if filename != self._current_filename or restarted:
+                self._current_filename = filename
+                self._last_position = None
+
+                self.plays += 1
+                self.play_counts[filename] += 1
+            elif self._last_position is not None:
+                delta = position - self._last_position
+
+                if 0 < delta <= (timestamp - self._last_timestamp) * 1000 + self.max_drift:
+                    self.total_listened += delta
+                    self.listened[filename] += delta
+
+                    if track_info['artist']:
+                        self.artists[track_info['artist']] += delta
+
+                    if track_info['genre']:
+                        self.genres[track_info['genre']] += delta
+
+            self._last_position = position
+            self._last_timestamp = timestamp
+
+        if self._last_snapshot is None:
+            self._last_snapshot = timestamp
+        elif self.snapshot_path and timestamp - self._last_snapshot >= self.snapshot_interval:
+            self.save()
+
+            self._last_snapshot = timestamp
+
+    def poll(self, client):
+        """Observe the current state of the player using a :class:`pyaimp.Client`.
+
+        :param pyaimp.Client client: Client to use
+        :rtype: None
+        """
+        self.observe(client.get_current_track_info(), client.get_playback_state(), client.get_player_position())
+
+    def top_tracks(self, n=10):
+        """Return the ``n`` most played filenames along with their number of plays.
+
+        :rtype: list
+        """
+        return self.play_counts.most_common(n)
+
+    def top_artists(self, n=10):
+        """Return the ``n`` most listened artists along with their listening time, in milliseconds.
+
+        :rtype: list
+        """
+        return self.artists.most_common(n)
+
+    def top_genres(self, n=10):
+        """Return the ``n`` most listened genres along with their listening time, in milliseconds.
+
+        :rtype: list
+        """
+        return self.genres.most_common(n)
+
+    def save(self, path=None):
+        """Atomically save the aggregates to a JSON file.
+
+        :param str path: Path to the file. Defaults to ``snapshot_path``
+        :raises ValueError: Neither ``path`` nor ``snapshot_path`` are set.
+        :rtype: None
+        """
+        path = path or self.snapshot_path
+
+        if not path:
+            raise ValueError('A path is required in order to save the statistics.')
+
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.snapshot_version,
+                'plays': self.plays,
+                'total_listened': self.total_listened,
+                'play_counts': self.play_counts,
+                'listened': self.listened,
+                'artists': self.artists,
+                'genres': self.genres
+            }, f)
+
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Create an instance from aggregates previously saved using :func:`pyaimp.ListeningStatistics.save`.
+
+        :param str path: Path to the file, which is also used as the ``snapshot_path`` if not given
+        :param kwargs: Other arguments of :class:`pyaimp.ListeningStatistics`
+        :raises ValueError: The file has been saved by an unsupported version.
+        :rtype: pyaimp.ListeningStatistics
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+        if snapshot.get('version') != cls.snapshot_version:
+            raise ValueError('Unsupported statistics snapshot version: {}'.format(snapshot.get('version')))
+
+        kwargs.setdefault('snapshot_path', path)
+
+        statistics = cls(**kwargs)
+
+        statistics.plays = snapshot['plays']
+        statistics.total_listened = snapshot['total_listened']
+        statistics.play_counts.update(snapshot['play_counts'])
+        statistics.listened.update(snapshot['listened'])
+        statistics.artists.update(snapshot['artists'])
+        statistics.genres.update(snapshot['genres'])
+
+        return statistics
+
+
+# -----------------------------------------------------
+# Shared state
+
+
+def _pack_shared_state(state, timestamp):
+    """Pack a :func:`pyaimp.Client.get_player_state` dictionary to the shared state layout: numeric fields
+    first, then UTF-8 strings prefixed by their length and truncated to ``SharedStateStringMaxSize`` bytes."""
+    values = dict(state, timestamp=timestamp)
+
+    values['playback_state'] = state['playback_state'].value if state['playback_state'] is not None else -1
+
+    ret = [
+        struct.pack(
+            '<' + ''.join(SharedStatePackFormat.values()),
+            *[values[key] for key in SharedStatePackFormat.keys()]
+        )
+    ]
+
+    for key in AIMPRemoteAccessTrackInfoStringFields.keys():
+        encoded = state[key].encode('utf-8')[:SharedStateStringMaxSize]
+
+        ret.append(struct.pack('<H', len(encoded)))
+        ret.append(encoded)
+
+    return b''.join(ret)
+
+
+def _unpack_shared_state(data):
+    """Unpack the shared state layout to a :func:`pyaimp.Client.get_player_state`-like dictionary (along
+    with the ``timestamp`` of its publication)."""
+    pack_format = '<' + ''.join(SharedStatePackFormat.values())
+
+    ret = dict(zip(SharedStatePackFormat.keys(), struct.unpack_from(pack_format, data)))
+
+    ret['playback_state'] = PlayBackState(ret['playback_state']) if ret['playback_state'] >= 0 else None
+
+    offset = struct.calcsize(pack_format)
+
+    for key in AIMPRemoteAccessTrackInfoStringFields.keys():
+        length, = struct.unpack_from('<H', data, offset)
+
+        offset += 2
+
+        ret[key] = data[offset:offset + length].decode('utf-8', 'ignore')
+
+        offset += length
+
+    return ret
+
+
+class StatePublisher:
+    """Periodically publish the player state to a named shared memory segment, so any number of local
+    processes may read it using :class:`pyaimp.StateReader` without querying AIMP themselves.
+
+    Snapshots are protected by a sequence lock: the sequence number, stored at the beginning of the segment,
+    is odd while a snapshot is being written and even otherwise.
+
+    :param pyaimp.Client client: Client to use
+    :param str name: Name of the shared memory segment
+    :param float interval: Number of seconds between two publications when using :func:`pyaimp.StatePublisher.run`
+    """
+
+    def __init__(self, client, name=SharedStateName, interval=0.1):
+        self.client = client
+        self.interval = interval
+
+        self._mapped_file = mmapfile(None, name, MaximumSize=SharedStateMapFileSize)
+
+        sequence, = struct.unpack(SharedStateSequenceFormat, self._mapped_file.read(struct.calcsize(SharedStateSequenceFormat)))
+
+        self._sequence = sequence + (sequence % 2)
+        self._stop = threading.Event()
+
+    def _write_sequence(self):
+        """Write the current sequence number at the beginning of the segment."""
+        self._mapped_file.seek(0)
+        self._mapped_file.write(struct.pack(SharedStateSequenceFormat, self._sequence))
+
+    def publish(self, state=None):
+        """Publish a snapshot of the player state.
+
+        :param dict state: State to publish. Defaults to the result of :func:`pyaimp.Client.get_player_state`
+        :rtype: None
+        """
+        payload = _pack_shared_state(state or self.client.get_player_state(), time.time())
+
+        self._sequence += 1
+        self._write_sequence()
+
+        self._mapped_file.write(payload)
+
+        self._sequence += 1
+        self._write_sequence()
+
+    def run(self):
+        """Publish snapshots every ``interval`` seconds until :func:`pyaimp.StatePublisher.stop` is called.
+
+        :rtype: None
+        """
+        self._stop.clear()
+
+        while not self._stop.is_set():
+            self.publish()
+
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        """Make :func:`pyaimp.StatePublisher.run` return.
+
+        :rtype: None
+        """
+        self._stop.set()
+
+    def close(self):
+        """Close the shared memory segment.
+
+        :rtype: None
+        """
+        self._mapped_file.close()
+
+
+class StateReader:
+    """Read the player state snapshots published by a :class:`pyaimp.StatePublisher`.
+
+    :param str name: Name of the shared memory segment
+    :param int retries: Maximum number of attempts to read a consistent snapshot
+    """
+
+    def __init__(self, name=SharedStateName, retries=1000):
+        self.retries = retries
+
+        self._mapped_file = mmapfile(None, name, MaximumSize=SharedStateMapFileSize)
+
+    def read(self):
+        """Return the latest published snapshot, which is a :func:`pyaimp.Client.get_player_state`-like
+        dictionary with an additional ``timestamp`` key (``float``) containing its publication time.
+
+        :raises RuntimeError: No consistent snapshot could be read.
+        :return: ``None`` if nothing has been published yet
+        :rtype: dict
+        """
+        sequence_size = struct.calcsize(SharedStateSequenceFormat)
+
+        for _ in range(self.retries):
+            self._mapped_file.seek(0)
+
+            data = self._mapped_file.read(SharedStateMapFileSize)
+
+            self._mapped_file.seek(0)
+
+            sequence_before, = struct.unpack_from(SharedStateSequenceFormat, data)
+            sequence_after, = struct.unpack(SharedStateSequenceFormat, self._mapped_file.read(sequence_size))
+
+            if sequence_before == 0:
+                return None
+
+            if sequence_before % 2 == 0 and sequence_before == sequence_after:
+                return _unpack_shared_state(data[sequence_size:])
+
+            time.sleep(0)
+
+        raise RuntimeError('Unable to read a consistent player state snapshot.')
+
+    def close(self):
+        """Close the shared memory segment.
+
+        :rtype: None
+        """
+        self._mapped_file.close()
+
+
+# -----------------------------------------------------
+# Notifications
+
+_message_window_class_ids = itertools.count()
+
+
+def _create_message_window(message_map):
+    """Create a hidden message-only window on the calling thread.
+
+    :param dict message_map: Message IDs mapped to ``(hwnd, msg, wparam, lparam)`` callables
+    :return: The window handle
+    """
+    window_class = win32gui.WNDCLASS()
+    window_class.hInstance = win32api.GetModuleHandle(None)
+    window_class.lpszClassName = 'pyaimp_{}_{}'.format(os.getpid(), next(_message_window_class_ids))
+    window_class.lpfnWndProc = message_map
+
+    win32gui.RegisterClass(window_class)
+
+    return win32gui.CreateWindowEx(
+        0, window_class.lpszClassName, None, 0, 0, 0, 0, 0, win32con.HWND_MESSAGE, 0, window_class.hInstance, None
+    )
+
+
+def _destroy_message_window(hwnd):
+    """Destroy a window created using :func:`pyaimp._create_message_window` along with its class."""
+    class_name = win32gui.GetClassName(hwnd)
+
+    win32gui.DestroyWindow(hwnd)
+    win32gui.UnregisterClass(class_name, win32api.GetModuleHandle(None))
+
+
+class MessageWindowSource:
+    """Default message source of :class:`pyaimp.NotificationListener`: a hidden message-only window
+    receiving the AIMP notifications on its own message pump thread.
+
+    Any object providing the same ``start`` and ``stop`` methods may be used instead (e.g in tests).
+    """
+
+    def __init__(self):
+        self.hwnd = None
+
+        self._thread = None
+        self._error = None
+
+    def _pump(self, handler, ready):
+        """Create the window then pump its messages until it's closed."""
+        try:
+            self.hwnd = _create_message_window({
+                WM_AIMP_NOTIFY: lambda hwnd, msg, wparam, lparam: handler(wparam, lparam) or 0,
+                win32con.WM_CLOSE: lambda hwnd, msg, wparam, lparam: win32gui.PostQuitMessage(0) or 0
+            })
+        except Exception as e:
+            self._error = e
+
+            return
+        finally:
+            ready.set()
+
+        win32gui.PumpMessages()
+
+        _destroy_message_window(self.hwnd)
+
+        self.hwnd = None
+
+    def start(self, handler):
+        """Create the window and start pumping its messages.
+
+        :param handler: Callable receiving the notification ID and its parameter
+        :raises pywintypes.error: The window cannot be created.
+        :return: The window handle to register to AIMP
+        """
+        ready = threading.Event()
+
+        self._error = None
+
+        self._thread = threading.Thread(target=self._pump, args=(handler, ready), daemon=True)
+        self._thread.start()
+
+        ready.wait()
+
+        if self._error:
+            self._thread.join()
+
+            raise self._error
+
+        return self.hwnd
+
+    def stop(self):
+        """Close the window and wait for the message pump thread to finish.
+
+        :rtype: None
+        """
+        win32gui.PostMessage(self.hwnd, win32con.WM_CLOSE, 0, 0)
+
+        self._thread.join()
+
+
+class NotificationListener:
+    """Receive AIMP change notifications instead of polling, and turn them into callbacks.
+
+    Only the data affected by a notification is re-read: the current track information when it changed,
+    or the value of the property which changed.
+
+    Callbacks are called from the message source thread (which is the message pump thread by default), and
+    use ``client`` from it. Don't share ``client`` with other threads.
+
+    :param pyaimp.Client client: Client to use
+    :param message_source: Source of the notifications. Defaults to a :class:`pyaimp.MessageWindowSource`
+    """
+
+    def __init__(self, client, message_source=None):
+        self.client = client
+        self.message_source = message_source or MessageWindowSource()
+
+        self._track_started_callbacks = []
+        self._track_info_changed_callbacks = []
+        self._property_changed_callbacks = []
+        self._hwnd = None
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def on_track_started(self, callback):
+        """Register a callable called with the :func:`pyaimp.Client.get_current_track_info` result when a
+        new track starts playing. May be used as a decorator."""
+        self._track_started_callbacks.append(callback)
+
+        return callback
+
+    def on_track_info_changed(self, callback):
+        """Register a callable called with the :func:`pyaimp.Client.get_current_track_info` result when the
+        current track information changes (e.g a new stream title). May be used as a decorator."""
+        self._track_info_changed_callbacks.append(callback)
+
+        return callback
+
+    def on_property_changed(self, callback):
+        """Register a callable called with the ID of the property which changed (one of the
+        ``AIMP_RA_PROPERTY_*`` constants) and its new value, as returned by the corresponding
+        :class:`pyaimp.Client` getter. May be used as a decorator."""
+        self._property_changed_callbacks.append(callback)
+
+        return callback
+
+    def start(self):
+        """Start the message source and register it to AIMP.
+
+        :rtype: None
+        """
+        self._hwnd = self.message_source.start(self._dispatch)
+
+        self.client._send_command(AIMP_RA_CMD_REGISTER_NOTIFY, self._hwnd)
+
+    def stop(self):
+        """Unregister the message source from AIMP and stop it.
+
+        :rtype: None
+        """
+        try:
+            self.client._send_command(AIMP_RA_CMD_UNREGISTER_NOTIFY, self._hwnd)
+        finally:
+            self.message_source.stop()
+
+            self._hwnd = None
+
+    def _dispatch(self, notification_id, parameter):
+        """Re-read the data affected by a notification and pass it to the corresponding callbacks."""
+        if notification_id in (AIMP_RA_NOTIFY_TRACK_START, AIMP_RA_NOTIFY_TRACK_INFO):
+            callbacks = self._track_started_callbacks if notification_id == AIMP_RA_NOTIFY_TRACK_START else self._track_info_changed_callbacks
+
+            if callbacks:
+                track_info = self.client.get_current_track_info()
+
+                for callback in callbacks:
+                    callback(track_info)
+        elif notification_id == AIMP_RA_NOTIFY_PROPERTY and self._property_changed_callbacks:
+            getter = AIMPPropertyGetters.get(parameter)
+
+            value = getattr(self.client, getter)() if getter else self.client._get_prop(parameter)
+
+            for callback in self._property_changed_callbacks:
+                callback(parameter, value)
+
+
+# -----------------------------------------------------
+# Player state encoding
+
+_player_state_header = struct.Struct('<BB')
+_player_state_string_length = struct.Struct('<H')
+_player_state_bitmap_size = (len(PlayerStateEncodingFields) + 7) // 8
+_player_state_fields = [
+    (key, None if fmt == 's' else struct.Struct('<' + fmt)) for key, fmt in PlayerStateEncodingFields.items()
+]
+_player_state_numeric_keys = [key for key, value_struct in _player_state_fields if value_struct is not None]
+_player_state_string_keys = [key for key, value_struct in _player_state_fields if value_struct is None]
+_player_state_playback_state_index = _player_state_numeric_keys.index('playback_state')
+_player_state_numeric = struct.Struct('<' + ''.join(
+    fmt for fmt in PlayerStateEncodingFields.values() if fmt != 's'
+))
+_player_state_full_bitmap = ((1 << len(PlayerStateEncodingFields)) - 1).to_bytes(_player_state_bitmap_size, 'little')
+
+
+def _encode_full_player_state(state):
+    """Encode all the fields of a state at once, numeric fields being packed first."""
+    values = [state[key] for key in _player_state_numeric_keys]
+
+    playback_state = values[_player_state_playback_state_index]
+
+    values[_player_state_playback_state_index] = playback_state.value if playback_state is not None else -1
+
+    ret = [
+        _player_state_header.pack(PlayerStateEncodingVersion, 0),
+        _player_state_full_bitmap,
+        _player_state_numeric.pack(*values)
+    ]
+
+    for key in _player_state_string_keys:
+        encoded = state[key].encode('utf-8')
+
+        ret.append(_player_state_string_length.pack(len(encoded)))
+        ret.append(encoded)
+
+    return b''.join(ret)
+
+
+def encode_player_state(state, previous=None):
+    """Encode a :func:`pyaimp.Client.get_player_state` dictionary to a compact binary form.
+
+    The encoded state starts with a version byte and a flags byte, followed by a bitmap of the encoded
+    fields and by the values of these fields: fixed-width little-endian numbers, and UTF-8 strings prefixed
+    by their 16 bits length.
+
+    If ``previous`` is given, only the fields which changed since this state are encoded, so unchanged
+    fields only cost one bit. The same previous state must then be given to :func:`pyaimp.decode_player_state`.
+
+    :param dict state: State to encode
+    :param dict previous: Previously encoded state to compute a delta against
+    :rtype: bytes
+    """
+    if previous is None:
+        return _encode_full_player_state(state)
+
+    bitmap = 0
+    values = []
+
+    for index, (key, value_struct) in enumerate(_player_state_fields):
+        value = state[key]
+
+        if previous[key] == value:
+            continue
+
+        bitmap |= 1 << index
+
+        if key == 'playback_state':
+            value = value.value if value is not None else -1
+
+        if value_struct is None:
+            encoded = value.encode('utf-8')
+
+            values.append(_player_state_string_length.pack(len(encoded)))
+            values.append(encoded)
+        else:
+            values.append(value_struct.pack(value))
+
+    return b''.join([
+        _player_state_header.pack(PlayerStateEncodingVersion, PlayerStateEncodingDeltaFlag),
+        bitmap.to_bytes(_player_state_bitmap_size, 'little')
+    ] + values)
+
+
+def decode_player_state(data, previous=None):
+    """Decode a state encoded using :func:`pyaimp.encode_player_state`.
+
+    :param bytes data: Encoded state
+    :param dict previous: Previously decoded state, required if ``data`` is a delta
+    :raises ValueError: ``data`` has been encoded using an unsupported version, or is a delta and ``previous`` isn't given.
+    :rtype: dict
+    """
+    version, flags = _player_state_header.unpack_from(data)
+
+    if version != PlayerStateEncodingVersion:
+        raise ValueError('Unsupported player state encoding version: {}'.format(version))
+
+    offset = _player_state_header.size + _player_state_bitmap_size
+
+    if not flags & PlayerStateEncodingDeltaFlag:
+        ret = dict(zip(_player_state_numeric_keys, _player_state_numeric.unpack_from(data, offset)))
+
+        ret['playback_state'] = PlayBackState(ret['playback_state']) if ret['playback_state'] >= 0 else None
+
+        offset += _player_state_numeric.size
+
+        for key in _player_state_string_keys:
+            length, = _player_state_string_length.unpack_from(data, offset)
+
+            offset += _player_state_string_length.size
+
+            ret[key] = bytes(data[offset:offset + length]).decode('utf-8')
+
+            offset += length
+
+        return ret
+
+    if previous is None:
+        raise ValueError('A previous state is required in order to decode a delta.')
+
+    ret = dict(previous)
+
+    bitmap = int.from_bytes(data[_player_state_header.size:offset], 'little')
+
+    for index, (key, value_struct) in enumerate(_player_state_fields):
+        if not bitmap & (1 << index):
+            continue
+
+        if value_struct is None:
+            length, = _player_state_string_length.unpack_from(data, offset)
+
+            offset += _player_state_string_length.size
+
+            ret[key] = bytes(data[offset:offset + length]).decode('utf-8')
+
+            offset += length
+        else:
+            value, = value_struct.unpack_from(data, offset)
+
+            offset += value_struct.size
+
+            if key == 'playback_state':
+                value = PlayBackState(value) if value >= 0 else None
+
+            ret[key] = value
+
+    return ret
+
+
+# -----------------------------------------------------
+# Scheduler
+
+
+class ScheduledAction:
+    """Handle to an action scheduled using a :class:`pyaimp.Scheduler`.
+
+    :param action: Callable to call, without any argument
+    :param str track: Filename of the track the action is bound to, if any
+    :param int position: Position in this track, in milliseconds, the action must be called at, if any
+    """
+
+    def __init__(self, action, track=None, position=None):
+        self.action = action
+        self.track = track
+        self.position = position
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the action from being called.
+
+        :rtype: None
+        """
+        self.cancelled = True
+
+
+class Scheduler:
+    """Call actions at given times or at given positions of the current track, from a single thread.
+
+    Time-based actions are kept in a heap and the thread sleeps until the next one is due. Track-based
+    actions are kept in a heap ordered by position: a single poll of AIMP is made to evaluate all of them,
+    at the time the next one is expected to be due or at most every ``resync_interval`` seconds (so seeks
+    and pauses are taken into account), and only while there are some pending.
+
+    Actions are called from the scheduler thread, which also uses ``client``. Exceptions raised by actions
+    or by polls of AIMP are logged using the ``pyaimp`` logger, and don't stop the scheduler.
+
+    :param pyaimp.Client client: Client to use
+    :param float resync_interval: Maximum number of seconds between two polls of AIMP while track-based actions are pending
+    :param float tolerance: Number of seconds an action may be called in advance
+    """
+
+    def __init__(self, client, resync_interval=1.0, tolerance=0.02):
+        self.client = client
+        self.resync_interval = resync_interval
+        self.tolerance = tolerance
+
+        self._timers = []
+        self._positions = []
+        self._track_ends = {}
+        self._counter = itertools.count()
+        self._current_track = None
+        self._next_poll = 0
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Start the scheduler thread.
+
+        :rtype: None
+        """
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread, if it's running. Pending actions are kept.
+
+        :rtype: None
+        """
+        with self._condition:
+            self._stopped = True
+
+            self._condition.notify()
+
+        if self._thread:
+            self._thread.join()
+
+            self._thread = None
+
+    def _get_current_track(self):
+        """Return the filename of the current track."""
+        return self.client.get_current_track_info()['filename']
+
+    def _add(self, queue, entry):
+        """Add an entry to one of the pending actions heaps and wake the scheduler thread up."""
+        with self._condition:
+            heapq.heappush(queue, entry)
+
+            if queue is self._positions:
+                self._next_poll = 0
+
+            self._condition.notify()
+
+        return entry[-1]
+
+    def after(self, delay, action):
+        """Call ``action`` after a delay.
+
+        :param float delay: Number of seconds to wait for
+        :param action: Callable to call, without any argument
+        :rtype: pyaimp.ScheduledAction
+        """
+        return self._add(self._timers, (time.monotonic() + delay, next(self._counter), ScheduledAction(action)))
+
+    def at(self, when, action):
+        """Call ``action`` at a given time, e.g ``datetime.datetime(2017, 10, 1, 23, 0)``.
+
+        :param when: A :class:`datetime.datetime` or a POSIX timestamp
+        :param action: Callable to call, without any argument
+        :rtype: pyaimp.ScheduledAction
+        """
+        if isinstance(when, datetime.datetime):
+            when = when.timestamp()
+
+        return self.after(when - time.time(), action)
+
+    def at_position(self, position, action):
+        """Call ``action`` when the current track reaches a given position. The action is discarded if another
+        track starts playing before.
+
+        :param int position: Position in the current track, in milliseconds
+        :param action: Callable to call, without any argument
+        :rtype: pyaimp.ScheduledAction
+        """
+        scheduled_action = ScheduledAction(action, self._get_current_track(), position)
+
+        return self._add(self._positions, (position, next(self._counter), scheduled_action))
+
+    def before_end(self, remaining, action):
+        """Call ``action`` a given time before the end of the current track.
+
+        :param int remaining: Number of milliseconds before the end of the current track
+        :param action: Callable to call, without any argument
+        :rtype: pyaimp.ScheduledAction
+        """
+        return self.at_position(max(self.client.get_current_track_duration() - remaining, 0), action)
+
+    def after_track(self, action):
+        """Call ``action`` as soon as the current track ends, i.e when another track starts playing or when
+        the playback is stopped.
+
+        :param action: Callable to call, without any argument
+        :rtype: pyaimp.ScheduledAction
+        """
+        scheduled_action = ScheduledAction(action, self._get_current_track())
+
+        with self._condition:
+            self._track_ends.setdefault(scheduled_action.track, []).append(scheduled_action)
+
+            self._next_poll = 0
+
+            self._condition.notify()
+
+        return scheduled_action
+
+    def _poll(self, with_duration):
+        """Return the current track, playback state, position and optionally duration, or ``None`` if AIMP
+        cannot be polled."""
+        try:
+            return (
+                self._get_current_track(),
+                self.client.get_playback_state(),
+                self.client.get_player_position(),
+                self.client.get_current_track_duration() if with_duration else None
+            )
+        except Exception:
+            logger.exception('Unable to poll AIMP')
+
+            return None
+
+    def _collect_track_actions(self, track, playback_state, position, duration):
+        """Pop the due track-based actions given a poll of AIMP, and schedule the next poll."""
+        due = []
+
+        if track != self._current_track:
+            self._current_track = track
+            self._positions[:] = [entry for entry in self._positions if entry[-1].track == track]
+
+            heapq.heapify(self._positions)
+
+        while self._positions and self._positions[0][0] <= position + self.tolerance * 1000:
+            due.append(heapq.heappop(self._positions)[-1])
+
+        ended = list(self._track_ends) if playback_state == PlayBackState.Stopped else [
+            ended_track for ended_track in self._track_ends if ended_track != track
+        ]
+
+        for ended_track in ended:
+            due.extend(self._track_ends.pop(ended_track))
+
+        next_check = self.resync_interval
+
+        if playback_state == PlayBackState.Playing:
+            if self._positions:
+                next_check = min(next_check, (self._positions[0][0] - position) / 1000)
+
+            if self._track_ends and duration is not None:
+                next_check = min(next_check, (duration - position) / 1000)
+
+        self._next_poll = time.monotonic() + max(next_check, self.tolerance)
+
+        return due
+
+    def _run(self):
+        """Scheduler thread main loop."""
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+
+                now = time.monotonic()
+                due = []
+
+                while self._timers and self._timers[0][0] <= now + self.tolerance:
+                    due.append(heapq.heappop(self._timers)[-1])
+
+                poll = (self._positions or self._track_ends) and now >= self._next_poll
+                with_duration = bool(self._track_ends)
+
+            observation = self._poll(with_duration) if poll else None
+
+            with self._condition:
+                if observation:
+                    due.extend(self._collect_track_actions(*observation))
+                elif poll:
+                    self._next_poll = time.monotonic() + self.resync_interval
+
+                if not due:
+                    now = time.monotonic()
+                    timeout = self._timers[0][0] - now if self._timers else None
+
+                    if self._positions or self._track_ends:
+                        next_poll = max(self._next_poll - now, 0)
+                        timeout = next_poll if timeout is None else min(timeout, next_poll)
+
+                    if not self._stopped:
+                        self._condition.wait(timeout)
+
+                    continue
+
+            for scheduled_action in due:
+                if scheduled_action.cancelled:
+                    continue
+
+                try:
+                    scheduled_action.action()
+                except Exception:
+                    logger.exception('Scheduled action failed')
+
+
+# -----------------------------------------------------
+# Queue manager
+
+
+class QueueManager:
+    """Feed the AIMP custom playback queue from a client-side backlog of tracks, from a background thread.
+
+    The queue is kept topped up ``ahead`` tracks ahead of the current one: as soon as a queued track starts
+    playing, the missing tracks are pushed in a single CLI ``/QUEUE`` command (see
+    :func:`pyaimp.Client.add_tracks_to_active_playlist_custom`), well before the end of the current track.
+    The player is polled every ``interval`` seconds, and right after the expected end of the current track
+    when it's closer than that.
+
+    Paths are compared with the filename reported by AIMP once normalized (absolute, case-normalized). When
+    another track than a queued one starts playing (e.g the queue has been cleared or skipped in AIMP), the
+    queued tracks are considered consumed and the queue is topped up again.
+
+    The background thread uses ``client``. Tracks which failed to be pushed are put back at the beginning
+    of the backlog and retried at the next poll. Errors are logged using the ``pyaimp`` logger.
+
+    :param pyaimp.Client client: Client to use
+    :param int ahead: Number of tracks to keep in the AIMP custom playback queue
+    :param float interval: Maximum number of seconds between two polls of AIMP
+    """
+
+    def __init__(self, client, ahead=2, interval=1.0):
+        self.client = client
+        self.ahead = ahead
+        self.interval = interval
+
+        self._backlog = deque()
+        self._queued = deque()
+        self._current_track = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        """Return the number of tracks in the backlog."""
+        return len(self._backlog)
+
+    @property
+    def queued(self):
+        """Tracks pushed to the AIMP custom playback queue which didn't start playing yet.
+
+        :rtype: list
+        """
+        with self._lock:
+            return [path for key, path in self._queued]
+
+    @staticmethod
+    def _get_track_key(path):
+        """Normalize a path so it can be compared with the filename reported by AIMP. URLs are left as-is."""
+        path = os.fspath(path)
+
+        if '://' in path:
+            return path
+
+        return os.path.normcase(os.path.abspath(path))
+
+    def append(self, path):
+        """Add a track at the end of the backlog.
+
+        :param str path: Path to a file (or URL to a stream)
+        :rtype: None
+        """
+        with self._lock:
+            self._backlog.append(path)
+
+    def extend(self, paths):
+        """Add tracks at the end of the backlog.
+
+        :param iterable paths: Paths to files (or URLs to streams)
+        :rtype: None
+        """
+        with self._lock:
+            self._backlog.extend(paths)
+
+    def clear(self):
+        """Remove all the tracks from the backlog. Tracks already pushed to AIMP are kept.
+
+        :rtype: None
+        """
+        with self._lock:
+            self._backlog.clear()
+
+    def start(self):
+        """Start the background thread.
+
+        :rtype: None
+        """
+        self._stop.clear()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, if it's running.
+
+        :rtype: None
+        """
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+
+            self._thread = None
+
+    def top_up(self):
+        """Poll the current track, then push tracks from the backlog if the AIMP custom playback queue has
+        less than ``ahead`` of them. Automatically called by the background thread.
+
+        :raises OSError: AIMP cannot be polled, or the tracks cannot be pushed.
+        :raises subprocess.CalledProcessError: The tracks cannot be pushed.
+        :return: Number of seconds before the expected end of the current track
+        :rtype: float
+        """
+        filename = self.client.get_current_track_info()['filename']
+        track = self._get_track_key(filename) if filename else None
+
+        with self._lock:
+            if track != self._current_track:
+                self._current_track = track
+
+                if any(key == track for key, path in self._queued):
+                    while self._queued.popleft()[0] != track:
+                        pass
+                else:
+                    self._queued.clear()
+
+            batch = [self._backlog.popleft() for _ in range(min(self.ahead - len(self._queued), len(self._backlog)))]
+
+        if batch:
+            try:
+                self.client.add_tracks_to_active_playlist_custom(batch)
+            except BaseException:
+                with self._lock:
+                    self._backlog.extendleft(reversed(batch))
+
+                raise
+
+            with self._lock:
+                self._queued.extend((self._get_track_key(path), path) for path in batch)
+
+        return (self.client.get_current_track_duration() - self.client.get_player_position()) / 1000
+
+    def _run(self):
+        """Background thread main loop."""
+        while not self._stop.is_set():
+            try:
+                remaining = self.top_up()
+            except Exception:
+                logger.exception('Unable to top up the AIMP custom playback queue')
+
+                remaining = 0
+
+            self._stop.wait(min(self.interval, remaining + 0.05) if remaining > 0 else self.interval)
+
+
+# -----------------------------------------------------
+# Search index
+
+
+class TrackIndex:
+    """In-memory search index of tracks, mapping words of their ``artist``, ``album``, ``title`` and
+    ``genre`` to their filenames.
+
+    It may be fed with every :func:`pyaimp.Client.get_current_track_info` result seen (e.g using
+    :func:`pyaimp.NotificationListener.on_track_started`), and with the files of scanned directories. Search
+    results may be given to :func:`pyaimp.Client.add_tracks_to_playlist_and_play`.
+
+    Query words are matched against the beginning of the indexed words, using a sorted list of these words
+    (which is rebuilt on the first search following changes), or anywhere inside them if no indexed word
+    starts with it, using a trigrams index.
+    """
+
+    fields = ('artist', 'album', 'title', 'genre')
+    snapshot_version = 1
+
+    def __init__(self):
+        self._tracks = {}
+        self._postings = {}
+        self._words = []
+        self._words_outdated = False
+        self._trigrams = {}
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __contains__(self, filename):
+        return filename in self._tracks
+
+    @staticmethod
+    def _tokenize(value):
+        """Split a string in lowercase words."""
+        return re.findall(r'\w+', value.lower())
+
+    @staticmethod
+    def _get_trigrams(word):
+        """Return the set of trigrams of a word."""
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+
+    def add(self, track_info):
+        """Add a track to the index, or update it if its filename is already indexed.
+
+        :param dict track_info: A :func:`pyaimp.Client.get_current_track_info` result, or any dictionary with
+                                a ``filename`` key and some of the indexed fields keys
+        :rtype: None
+        """
+        filename = track_info['filename']
+
+        if not filename:
+            return
+
+        track = {field: track_info.get(field) or '' for field in self.fields}
+
+        if self._tracks.get(filename) == track:
+            return
+
+        self.remove(filename)
+
+        self._tracks[filename] = track
+
+        for field, value in track.items():
+            for word in self._tokenize(value):
+                if word not in self._postings:
+                    self._postings[word] = {}
+                    self._words_outdated = True
+
+                    for trigram in self._get_trigrams(word):
+                        self._trigrams.setdefault(trigram, set()).add(word)
+
+                self._postings[word].setdefault(filename, set()).add(field)
+
+    def remove(self, filename):
+        """Remove a track from the index, if it's indexed.
+
+        :param str filename: Filename of the track
+        :rtype: None
+        """
+        track = self._tracks.pop(filename, None)
+
+        if not track:
+            return
+
+        for value in track.values():
+            for word in self._tokenize(value):
+                postings = self._postings.get(word)
+
+                if postings is None:
+                    continue
+
+                postings.pop(filename, None)
+
+                if postings:
+                    continue
+
+                del self._postings[word]
+                self._words_outdated = True
+
+                for trigram in self._get_trigrams(word):
+                    self._trigrams[trigram].discard(word)
+
+                    if not self._trigrams[trigram]:
+                        del self._trigrams[trigram]
+
+    def add_directories(self, dirs, scanner=None):
+        """Add the files found in directories, which aren't indexed yet, assuming an ``Artist/Album/Track``
+        layout: the file name is indexed as the ``title``, its parent directory name as the ``album`` and the
+        next one as the ``artist``.
+
+        :param dirs: Path to a directory, or list of paths to directories
+        :param pyaimp.DirectoryScanner scanner: Scanner to use. A new one accepting all files if not provided
+        :rtype: None
+        """
+        if isinstance(dirs, str):
+            dirs = [dirs]
+
+        scanner = scanner or DirectoryScanner()
+
+        for path in scanner.scan(*dirs):
+            if path in self._tracks:
+                continue
+
+            album_dir = os.path.dirname(path)
+
+            self.add({
+                'filename': path,
+                'title': os.path.splitext(os.path.basename(path))[0],
+                'album': os.path.basename(album_dir),
+                'artist': os.path.basename(os.path.dirname(album_dir))
+            })
+
+    def _expand(self, word):
+        """Return the indexed words starting with a word, or containing it if there isn't any."""
+        if self._words_outdated:
+            self._words = sorted(self._postings)
+            self._words_outdated = False
+
+        ret = set()
+
+        for index in range(bisect.bisect_left(self._words, word), len(self._words)):
+            if not self._words[index].startswith(word):
+                break
+
+            ret.add(self._words[index])
+
+        if ret or len(word) < 3:
+            return ret
+
+        candidates = None
+
+        for trigram in self._get_trigrams(word):
+            words = self._trigrams.get(trigram, set())
+
+            candidates = words if candidates is None else candidates & words
+
+            if not candidates:
+                return ret
+
+        return {candidate for candidate in candidates if word in candidate}
+
+    def search(self, query, field=None, limit=None):
+        """Return the filenames of the tracks matching all the words of a query, e.g ``pink money``.
+
+        :param str query: Words to search for
+        :param str field: Only search in this field (one of ``artist``, ``album``, ``title`` or ``genre``)
+        :param int limit: Maximum number of filenames to return
+        :rtype: list
+        """
+        ret = None
+
+        for word in self._tokenize(query):
+            matches = set()
+
+            for indexed_word in self._expand(word):
+                for filename, fields in self._postings[indexed_word].items():
+                    if field is None or field in fields:
+                        matches.add(filename)
+
+            ret = matches if ret is None else ret & matches
+
+            if not ret:
+                return []
+
+        return sorted(ret or [])[:limit]
+
+    def save(self, path):
+        """Atomically save the indexed tracks to a JSON file.
+
+        :param str path: Path to the file
+        :rtype: None
+        """
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.snapshot_version,
+                'tracks': self._tracks
+            }, f)
+
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path):
+        """Create an index from tracks previously saved using :func:`pyaimp.TrackIndex.save`.
+
+        :param str path: Path to the file
+        :raises ValueError: The file has been saved by an unsupported version.
+        :rtype: pyaimp.TrackIndex
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+        if snapshot.get('version') != cls.snapshot_version:
+            raise ValueError('Unsupported track index snapshot version: {}'.format(snapshot.get('version')))
+
+        index = cls()
+
+        for filename, track in snapshot['tracks'].items():
+            index.add(dict(track, filename=filename))
+
+        return index
+
+
+# -----------------------------------------------------
+# Bulk decoding
+
+
+def _import_numpy():
+    """Import NumPy on demand, as it's only needed by :class:`pyaimp.TrackInfoRecords`.
+
+    :raises RuntimeError: NumPy isn't installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('NumPy is required in order to decode track info records.') from None
+
+    return numpy
+
+
+@functools.lru_cache()
+def _get_track_info_dtype():
+    """Return the NumPy structured dtype mirroring ``AIMPRemoteAccessPackFormat`` (using the same native
+    alignment as :mod:`struct`), the raw track strings being stored in the trailing ``TrackData`` field."""
+    numpy = _import_numpy()
+
+    names = []
+    formats = []
+    offsets = []
+    pack_format = ''
+
+    for name, fmt in AIMPRemoteAccessPackFormat.items():
+        count, code = int(fmt[:-1] or 1), fmt[-1]
+
+        names.append(name)
+        formats.append((numpy.dtype(code), (count,)) if count > 1 else numpy.dtype(code))
+        offsets.append(struct.calcsize(pack_format + fmt) - struct.calcsize(fmt))
+
+        pack_format += fmt
+
+    header_size = struct.calcsize(pack_format)
+
+    names.append('TrackData')
+    formats.append(numpy.dtype((numpy.void, AIMPRemoteAccessMapFileSize - header_size)))
+    offsets.append(header_size)
+
+    return numpy.dtype({
+        'names': names,
+        'formats': formats,
+        'offsets': offsets,
+        'itemsize': AIMPRemoteAccessMapFileSize
+    })
+
+
+class TrackInfoRecords:
+    """Read-only view over many contiguous raw snapshots of the AIMP remote access buffer (the one read by
+    :func:`pyaimp.Client.get_current_track_info`), each one being ``AIMPRemoteAccessMapFileSize`` bytes long.
+
+    Numeric fields are available column-wise as NumPy arrays using :func:`pyaimp.TrackInfoRecords.column`,
+    while strings are only decoded for the records which are actually accessed by index. Records stored in
+    a file are memory-mapped, so memory usage doesn't depend on the number of records.
+
+    Slicing an instance returns a new :class:`pyaimp.TrackInfoRecords` sharing the same memory, which may
+    be used to process records in chunks.
+
+    .. note::
+
+       This class requires `NumPy <http://www.numpy.org/>`_ (``pip install pyaimp[numpy]``).
+
+    :param numpy.ndarray records: Array of the ``AIMPRemoteAccessPackFormat`` structured dtype
+    """
+
+    def __init__(self, records):
+        self._records = records
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Create an instance over a bytes-like object (``bytes``, ``bytearray``, ``mmap``, NumPy array...)
+        containing contiguous records, without copying it.
+
+        :param buffer: Object supporting the buffer protocol
+        :raises RuntimeError: NumPy isn't installed.
+        :raises ValueError: The buffer size isn't a multiple of the record size.
+        :rtype: pyaimp.TrackInfoRecords
+        """
+        return cls(_import_numpy().frombuffer(buffer, dtype=_get_track_info_dtype()))
+
+    @classmethod
+    def from_file(cls, filename):
+        """Create an instance over a file containing contiguous records, which is memory-mapped.
+
+        :param str filename: Path to the file
+        :raises RuntimeError: NumPy isn't installed.
+        :raises ValueError: The file size isn't a multiple of the record size.
+        :rtype: pyaimp.TrackInfoRecords
+        """
+        return cls(_import_numpy().memmap(filename, dtype=_get_track_info_dtype(), mode='r'))
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        """Return the record at ``index`` decoded like :func:`pyaimp.Client.get_current_track_info` does,
+        or a new :class:`pyaimp.TrackInfoRecords` if ``index`` is a slice."""
+        if isinstance(index, slice):
+            return TrackInfoRecords(self._records[index])
+
+        meta_data_unpacked = dict(zip(self._records.dtype.names, self._records[index].item()))
+
+        return _decode_track_info(meta_data_unpacked, meta_data_unpacked['TrackData'])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name):
+        """Return all the values of a numeric field as a NumPy array.
+
+        :param str name: One of the numeric :func:`pyaimp.Client.get_current_track_info` dictionary keys (e.g
+                         ``duration``), or a raw ``AIMPRemoteAccessPackFormat`` field name (e.g ``Duration``)
+        :raises KeyError: The field doesn't exist.
+        :rtype: numpy.ndarray
+        """
+        return self._records[AIMPRemoteAccessTrackInfoNumericFields.get(name, name)]
+
+    def iter_track_info(self, indices):
+        """Decode the records at the given indices only.
+
+        :param iterable indices: Indices of the records to decode, e.g ``numpy.flatnonzero(mask)``
+        :rtype: generator
+        """
+        for index in indices:
+            yield self[int(index)]
+
+
+# -----------------------------------------------------
+# Daemon
+
+
+def _get_client_command(client, command):
+    """Return the bound :class:`pyaimp.Client` method named ``command``, which must be one of ``DaemonCommands``.
+
+    :raises ValueError: ``command`` isn't allowed.
+    """
+    if not isinstance(command, str) or command not in DaemonCommands:
+        raise ValueError('Unknown command: {}'.format(command))
+
+    return getattr(client, command)
+
+
+def _json_default(obj):
+    """Serialize values :mod:`json` doesn't know about (i.e :class:`pyaimp.PlayBackState` members)."""
+    if isinstance(obj, Enum):
+        return obj.name
+
+    raise TypeError('{} is not JSON serializable'.format(repr(obj)))
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single newline-delimited JSON request sent by :func:`pyaimp.send_to_daemon`, then close the
+    connection.
+
+    Requests being handled one at a time, the connection is dropped if the request isn't received in time,
+    is malformed or doesn't contain the daemon token, so no client can block the daemon.
+    """
+
+    timeout = 1.0
+
+    def _respond(self, response):
+        self.wfile.write(json.dumps(response, default=_json_default).encode('utf-8') + b'\n')
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return
+
+        try:
+            request = json.loads(line.decode('utf-8'))
+
+            authorized = isinstance(request, dict) and hmac.compare_digest(
+                str(request.get('token')).encode('utf-8'), self.server.token.encode('utf-8')
+            )
+        except ValueError:
+            authorized = False
+
+        if not authorized:
+            response = {'error': 'Invalid request.'}
+        else:
+            try:
+                args = request.get('args', [])
+
+                if not isinstance(args, list):
+                    raise ValueError('Command arguments must be a list.')
+
+                response = {'result': self.server.dispatch(request.get('command'), args)}
+            except Exception as e:
+                response = {'error': str(e)}
+
+        try:
+            self._respond(response)
+        except OSError:
+            pass
+
+
+class Daemon(socketserver.TCPServer):
+    """Long-lived local server holding a warm :class:`pyaimp.Client` instance.
+
+    Commands sent using :func:`pyaimp.send_to_daemon` (or ``python -m pyaimpctl``) are forwarded to this
+    client, so they don't pay the interpreter startup and the AIMP detection costs. Requests are handled
+    one at a time, the client being used from a single thread. Only the commands listed in
+    ``DaemonCommands`` are allowed.
+
+    Requests must contain a random token, generated when the daemon starts and written to a file only
+    readable by the current user in its local application data directory. This file is deleted when the
+    daemon is closed.
+
+    If AIMP has been restarted in the meantime, :func:`pyaimp.Client.detect_aimp` is automatically called
+    before running the next command.
+
+    :param str host: Address to listen to. Defaults to the loopback interface
+    :param int port: Port to listen to
+    :param pyaimp.Client client: Client to use. A new one is created if not provided
+    :raises RuntimeError: The AIMP window cannot be found.
+    """
+
+    def __init__(self, host=DAEMON_DEFAULT_HOST, port=DAEMON_DEFAULT_PORT, client=None):
+        self.client = client or Client()
+        self.token = binascii.hexlify(os.urandom(32)).decode('ascii')
+
+        self._token_path = None
+
+        super().__init__((host, port), _DaemonRequestHandler)
+
+        self._token_path = _get_daemon_token_path(port)
+
+        try:
+            os.remove(self._token_path)
+        except FileNotFoundError:
+            pass
+
+        with os.fdopen(os.open(self._token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w') as f:
+            f.write(self.token)
+
+    def server_close(self):
+        super().server_close()
+
+        if not self._token_path:
+            return
+
+        try:
+            os.remove(self._token_path)
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, command, args):
+        """Run ``command`` with ``args`` on the warm client and return its result.
+
+        :param str command: One of ``DaemonCommands``
+        :param list args: Positional arguments to pass to this method
+        :raises ValueError: ``command`` isn't allowed.
+        """
+        method = _get_client_command(self.client, command)
+
+        if not win32gui.IsWindow(self.client._get_window()):
+            self.client.detect_aimp()
+
+        return method(*args)
+
+
+def main(argv=None):
+    """Entry point of ``python -m pyaimp``.
+
+    Either run a :class:`pyaimp.Daemon` (``--daemon``), or send a single command using
+    :func:`pyaimpctl.main` (prefer running ``python -m pyaimpctl`` directly, which starts faster).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    if '--daemon' not in argv:
+        return pyaimpctl.main(argv)
+
+    parser = argparse.ArgumentParser(prog='python -m pyaimp', description='Remote control AIMP.')
+    parser.add_argument('--daemon', action='store_true', help='run a daemon holding a warm client')
+    parser.add_argument('--host', default=DAEMON_DEFAULT_HOST, help='daemon address')
+    parser.add_argument('--port', type=int, default=DAEMON_DEFAULT_PORT, help='daemon port')
+
+    options = parser.parse_args(argv)
+
+    try:
+        with Daemon(options.host, options.port) as daemon:
+            daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (RuntimeError, OSError) as e:
+        print(e, file=sys.stderr)
+
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Minimal command-line client of the ``pyaimp`` daemon, meant to be run from global hotkeys.
+
+Only the modules required to forward a command to a running :class:`pyaimp.Daemon` are imported, so it
+starts as fast as possible. ``pyaimp`` is only imported if no daemon is running, to run the command using
+a new :class:`pyaimp.Client` instance.
+
+Usage: ``python -m pyaimpctl [--host HOST] [--port PORT] command [args...]``
+"""
+import socket
+import json
+import os
+import sys
+
+DAEMON_DEFAULT_HOST = '127.0.0.1'
+DAEMON_DEFAULT_PORT = 47200
+DAEMON_CONNECT_TIMEOUT = 0.25
+
+USAGE = 'usage: python -m pyaimpctl [--host HOST] [--port PORT] command [args...]'
+
+
+def _get_daemon_token_path(port):
+    """Return the path to the file containing the token of the daemon listening to ``port``, which is
+    located in the user-only local application data directory."""
+    return os.path.join(
+        os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'),
+        'pyaimp-daemon-{}.token'.format(port)
+    )
+
+
+def _parse_command_argument(value):
+    """Convert a command-line argument to a ``bool`` or an ``int`` if it looks like one, or leave it as-is."""
+    if value in ('True', 'False'):
+        return value == 'True'
+
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _connect_to_daemon(host, port, timeout):
+    """Read the token of the daemon listening to ``port`` and connect to it.
+
+    :raises OSError: No daemon is running.
+    :return: The connected socket and the token
+    """
+    with open(_get_daemon_token_path(port), 'r') as f:
+        token = f.read().strip()
+
+    return socket.create_connection((host, port), timeout=timeout), token
+
+
+def _request_daemon(connection, command, args, timeout):
+    """Send a request to the daemon using a connection returned by :func:`pyaimpctl._connect_to_daemon` then
+    close it, and return the result."""
+    sock, token = connection
+
+    with sock:
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps({'token': token, 'command': command, 'args': list(args)}).encode('utf-8') + b'\n')
+
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline().decode('utf-8'))
+
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+
+    return response['result']
+
+
+def send_to_daemon(command, *args, host=DAEMON_DEFAULT_HOST, port=DAEMON_DEFAULT_PORT, timeout=5.0, connect_timeout=DAEMON_CONNECT_TIMEOUT):
+    """Run a :class:`pyaimp.Client` method in a running :class:`pyaimp.Daemon` and return its result.
+
+    The result is transmitted as JSON, so :class:`pyaimp.PlayBackState` members are returned by name.
+
+    :param str command: One of ``pyaimp.DaemonCommands``, e.g ``play_pause``
+    :param args: Positional arguments to pass to this method
+    :param str host: Address the daemon is listening to
+    :param int port: Port the daemon is listening to
+    :param float timeout: Maximum number of seconds to wait for the daemon response
+    :param float connect_timeout: Maximum number of seconds to wait for the connection to the daemon
+    :raises OSError: No daemon is running, or it didn't respond in time.
+    :raises RuntimeError: The command failed in the daemon.
+    """
+    return _request_daemon(_connect_to_daemon(host, port, connect_timeout), command, args, timeout)
+
+
+def main(argv=None):
+    """Entry point of ``python -m pyaimpctl``: send a single command to the running daemon, falling back to a
+    new :class:`pyaimp.Client` if there isn't any."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    host = DAEMON_DEFAULT_HOST
+    port = DAEMON_DEFAULT_PORT
+
+    try:
+        while argv and argv[0] in ('--host', '--port'):
+            option, value = argv.pop(0), argv.pop(0)
+
+            if option == '--host':
+                host = value
+            else:
+                port = int(value)
+    except (IndexError, ValueError):
+        argv = []
+
+    if not argv:
+        print(USAGE, file=sys.stderr)
+
+        return 2
+
+    command = argv[0]
+    args = [_parse_command_argument(arg) for arg in argv[1:]]
+
+    try:
+        try:
+            connection = _connect_to_daemon(host, port, DAEMON_CONNECT_TIMEOUT)
+        except OSError:
+            connection = None
+
+        if connection:
+            output = json.dumps(_request_daemon(connection, command, args, 5.0))
+        else:
+            import pyaimp
+
+            output = json.dumps(
+                pyaimp._get_client_command(pyaimp.Client(), command)(*args),
+                default=pyaimp._json_default
+            )
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(e, file=sys.stderr)
+
+        return 1
+
+    if output != 'null':
+        print(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
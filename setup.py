@@ -15,13 +15,17 @@ setup(
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Libraries',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.6',
         'Operating System :: Microsoft :: Windows'
     ],
     keywords='aimp remote api wrapper client',
-    py_modules=['pyaimp'],
+    python_requires='>=3.6',
+    py_modules=['pyaimp', 'pyaimpctl'],
     install_requires=[
         'pypiwin32'
     ],
+    extras_require={
+        'numpy': ['numpy']
+    },
     download_url='https://github.com/EpocDotFr/pyaimp/archive/pyaimp-{version}.tar.gz'.format(version=pyaimp.__version__)
 )